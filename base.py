@@ -1,13 +1,38 @@
 from dataclasses import dataclass
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Tuple
 import subprocess
 import threading
 from collections import deque
 import requests
 import os
 import signal
+import time
+import orjson
+import json
 from protocols import PROTOCOLS
 
+# path -> (mtime_ns, size, parsed JSON), shared by the zoos and runtimes that read JSON files from disk
+_JSON_CACHE: Dict[str, Tuple[int, int, Any]] = {}
+
+def load_json_cached(path: str) -> Any:
+    """Parse a JSON file, reusing the previous result while its mtime and size are unchanged.
+    
+    The returned object is shared between callers and must not be modified.
+    """
+    st = os.stat(path)
+    cached = _JSON_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson rejects NaN/Infinity, which Python-written files (e.g. some HF configs) contain
+        data = json.loads(raw)
+    _JSON_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
 class Runtime:
     pass
         
@@ -19,6 +44,13 @@ class Zoo:
     def toggle(self):
         self.enabled = not self.enabled
 
+    def catalog_version(self) -> Any:
+        """Return a cheap token that changes whenever catalog() would, or None if unknown.
+        
+        Zoos returning None are rescanned every time their catalog is requested.
+        """
+        return None
+
 @dataclass
 class RuntimeParameter:
     """Data class describing a configurable runtime parameter."""
@@ -113,9 +145,12 @@ class Listener:
     def __str__(self) -> str:
         return f"Listener({self.protocol}://{self.host}:{self.port})"
 
-@dataclass
+@dataclass(slots=True)
 class Model:
-    """Data class representing a machine learning model."""
+    """Data class representing a machine learning model.
+    
+    Catalogs can hold thousands of these, so instances use slots and cannot take extra attributes.
+    """
     zoo_name: str
     model_id: str
     model_format: str
@@ -138,6 +173,9 @@ class Model:
 class RunningModel:
     """Class representing and controlling a running model instance."""
 
+    # Seconds a health check result is reused, so frequent status polls do not each hit the server
+    ready_ttl = 0.5
+
     def __init__(self, runtime: Runtime, model: Model, environment: EnvironmentSet,
                  listener: Listener, command: List[str], extra_environment: Dict[str,str] = {},
                  working_directory: str = None):
@@ -164,6 +202,8 @@ class RunningModel:
         self._log_thread = None
         self._running = False
         self._pgid = None
+        self._ready_checked_at = None
+        self._ready = False
         
         # Seed the logs with command and environment
         self._seed_logs()
@@ -225,9 +265,17 @@ class RunningModel:
             dict: A dictionary containing 'running' and 'ready' status
         """
         running = self.process is not None and self.process.poll() is None
-        ready = running and self._is_ready()
+        ready = running and self._cached_is_ready()
         return {"running": running, "ready": ready}
 
+    def _cached_is_ready(self) -> bool:
+        """Return the result of _is_ready(), reusing it for up to ready_ttl seconds."""
+        now = time.monotonic()
+        if self._ready_checked_at is None or now - self._ready_checked_at >= self.ready_ttl:
+            self._ready = self._is_ready()
+            self._ready_checked_at = now
+        return self._ready
+
     def _is_ready(self) -> bool:
         """Check if the model server is ready to accept requests.
         
@@ -1,6 +1,5 @@
 import os
-import tempfile
-import json
+import shlex
 from pathlib import Path
 from base import *
 from typing import Any, List, Dict
@@ -58,6 +57,7 @@ class LlamaRuntime(Runtime):
                 param_default=""
             )
         ]
+        self._params_by_name = {param.param_name: param for param in self.runtime_params}
 
     def spawn(self, 
               environment: EnvironmentSet, 
@@ -82,7 +82,7 @@ class LlamaRuntime(Runtime):
             raise ValueError(f"Unsupported model format: {model.model_format}")
 
         # Build command line
-        context_param = next(param for param in self.runtime_params if param.param_name == "context")
+        context_param = self._params_by_name["context"]
         context_value = context_param.param_enum[param_list.get("context", "4K")]
         cmd = [
             self.bin_path,
@@ -164,7 +164,90 @@ class VLLMRuntime(Runtime):
                 param_description="Allow remote code execution",
                 param_type="bool",
                 param_default=False
-            ),            
+            ),
+            RuntimeParameter(
+                param_name="enable_prefix_caching",
+                param_description="Enable automatic prefix caching",
+                param_type="bool",
+                param_default=True
+            ),
+            RuntimeParameter(
+                param_name="enable_chunked_prefill",
+                param_description="Enable chunked prefill",
+                param_type="bool",
+                param_default=True
+            ),
+            RuntimeParameter(
+                param_name="max_num_batched_tokens",
+                param_description="Maximum tokens per batch (0 for vLLM default)",
+                param_type="int",
+                param_default=0
+            ),
+            RuntimeParameter(
+                param_name="max_num_seqs",
+                param_description="Maximum sequences per batch (0 for vLLM default)",
+                param_type="int",
+                param_default=0
+            ),
+            RuntimeParameter(
+                param_name="kv_cache_dtype",
+                param_description="KV cache data type",
+                param_type="enum",
+                param_default="auto",
+                param_enum={
+                    "auto": "auto",
+                    "fp8": "fp8",
+                    "fp8_e5m2": "fp8_e5m2",
+                    "fp8_e4m3": "fp8_e4m3"
+                }
+            ),
+            RuntimeParameter(
+                param_name="quantization",
+                param_description="Weight quantization method",
+                param_type="enum",
+                param_default="none",
+                param_enum={
+                    "none": None,
+                    "awq": "awq",
+                    "gptq": "gptq",
+                    "fp8": "fp8"
+                }
+            ),
+            RuntimeParameter(
+                param_name="spec_method",
+                param_description="Speculative decoding method (eagle needs an EAGLE speculative_model)",
+                param_type="enum",
+                param_default="draft_model",
+                param_enum={
+                    "ngram": "ngram",
+                    "eagle": "eagle",
+                    "draft_model": "draft_model"
+                }
+            ),
+            RuntimeParameter(
+                param_name="speculative_model",
+                param_description="Draft model for speculative decoding (unused for ngram)",
+                param_type="str",
+                param_default=""
+            ),
+            RuntimeParameter(
+                param_name="num_speculative_tokens",
+                param_description="Number of speculative tokens (0 to disable)",
+                param_type="int",
+                param_default=0
+            ),
+            RuntimeParameter(
+                param_name="ngram_prompt_lookup_max",
+                param_description="Maximum n-gram size matched against the prompt (ngram only)",
+                param_type="int",
+                param_default=4
+            ),
+            RuntimeParameter(
+                param_name="speculative_draft_tensor_parallel_size",
+                param_description="Number of GPUs for the draft model",
+                param_type="int",
+                param_default=1
+            ),
             RuntimeParameter(
                 param_name="extra_args",
                 param_description="Optional additional arguments to the binary",
@@ -172,6 +255,7 @@ class VLLMRuntime(Runtime):
                 param_default=""
             )            
         ]
+        self._params_by_name = {param.param_name: param for param in self.runtime_params}
 
     def spawn(self, 
               environment: EnvironmentSet, 
@@ -196,46 +280,91 @@ class VLLMRuntime(Runtime):
             raise ValueError(f"Unsupported model format: {model.model_format}")
 
         # Build command line      
-        max_len_param = next(param for param in self.runtime_params if param.param_name == "max_model_len")
+        max_len_param = self._params_by_name["max_model_len"]
         max_len_value = max_len_param.param_enum[param_list.get("max_model_len", "4K")]
         
         # Build the vllm command
-        vllm_cmd = (
-            f"vllm serve {model.model_id} "
-            f"--host {listener.host} "
-            f"--port {listener.port} "
-            f"--tensor-parallel-size {param_list.get('tensor_parallel_size', 1)} "
-            f"--max-model-len {max_len_value} "
-            f"--gpu-memory-utilization {param_list.get('gpu_memory_utilization', 0.95)}"
-        )
+        cmd = [
+            "vllm", "serve", model.model_id,
+            "--host", listener.host,
+            "--port", str(listener.port),
+            "--tensor-parallel-size", str(param_list.get('tensor_parallel_size', 1)),
+            "--max-model-len", str(max_len_value),
+            "--gpu-memory-utilization", str(param_list.get('gpu_memory_utilization', 0.95))
+        ]
+
+        # Add speculative decoding
+        num_speculative_tokens = int(param_list.get('num_speculative_tokens', 0) or 0)
+        if num_speculative_tokens > 0:
+            spec_param = self._params_by_name["spec_method"]
+            spec_method = spec_param.param_enum[param_list.get("spec_method", "draft_model")]
+            speculative_model = param_list.get("speculative_model", "").strip()
+            if spec_method == "ngram":
+                cmd.extend([
+                    "--speculative-model", "[ngram]",
+                    "--num-speculative-tokens", str(num_speculative_tokens),
+                    "--ngram-prompt-lookup-max", str(param_list.get('ngram_prompt_lookup_max', 4))
+                ])
+            else:
+                # eagle and draft_model pass the same flags, vLLM detects EAGLE from the draft model's config
+                if not speculative_model:
+                    raise ValueError(f"Speculative method {spec_method} requires a speculative_model")
+                cmd.extend([
+                    "--speculative-model", speculative_model,
+                    "--num-speculative-tokens", str(num_speculative_tokens),
+                    "--speculative-draft-tensor-parallel-size", str(param_list.get('speculative_draft_tensor_parallel_size', 1))
+                ])
 
         if param_list.get('enforce_eager', True):
-            vllm_cmd += " --enforce-eager"
+            cmd.append("--enforce-eager")
 
         if param_list.get('trust_remote_code', True):
-            vllm_cmd += " --trust_remote_code"
-            
+            cmd.append("--trust_remote_code")
+
+        if param_list.get('enable_prefix_caching', True):
+            cmd.append("--enable-prefix-caching")
+
+        if param_list.get('enable_chunked_prefill', True):
+            cmd.append("--enable-chunked-prefill")
+
+        # Continuous batching limits, 0 leaves the vLLM default in place
+        max_num_batched_tokens = int(param_list.get('max_num_batched_tokens', 0) or 0)
+        if max_num_batched_tokens > 0:
+            cmd.extend(["--max-num-batched-tokens", str(max_num_batched_tokens)])
+
+        max_num_seqs = int(param_list.get('max_num_seqs', 0) or 0)
+        if max_num_seqs > 0:
+            cmd.extend(["--max-num-seqs", str(max_num_seqs)])
+
+        # Add KV cache and weight quantization, auto/none defer to vLLM autodetect
+        kv_cache_param = self._params_by_name["kv_cache_dtype"]
+        kv_cache_value = kv_cache_param.param_enum[param_list.get("kv_cache_dtype", "auto")]
+        if kv_cache_value != "auto":
+            cmd.extend(["--kv-cache-dtype", kv_cache_value])
+
+        quantization_param = self._params_by_name["quantization"]
+        quantization_value = quantization_param.param_enum[param_list.get("quantization", "none")]
+        if quantization_value is not None:
+            cmd.extend(["--quantization", quantization_value])
+
         # Add extra arguments if provided
         extra_args = param_list.get("extra_args", "").strip()
         if extra_args:
-            vllm_cmd.extend(extra_args.split())
-            
-        # Create temporary shell script
-        script_fd, script_path = tempfile.mkstemp(prefix='vllm_', suffix='.sh')
-        with os.fdopen(script_fd, 'w') as f:
-            f.write(f"""#!/bin/bash
-source {self.venv_path}/bin/activate
-echo env: $CUDA_VISIBLE_DEVICES $CUDA_DEVICE_ORDER
-{vllm_cmd}
-""")
-        os.chmod(script_path, 0o755)
+            cmd.extend(shlex.split(extra_args))
+
+        # Activate the venv and exec vllm in place of the shell
+        script = (
+            f"source {shlex.quote(os.path.join(self.venv_path, 'bin', 'activate'))} && "
+            f"echo env: $CUDA_VISIBLE_DEVICES $CUDA_DEVICE_ORDER && "
+            f"exec {shlex.join(cmd)}"
+        )
         listener.protocol = 'openai'
         return RunningModel(
             runtime=self,
             model=model,
             environment=environment,
             listener=listener,
-            command=[script_path]
+            command=["bash", "-c", script]
         )
 
 class LlamaSrbRuntime(Runtime):
@@ -276,6 +405,7 @@ class LlamaSrbRuntime(Runtime):
                 param_default=4
             )
         ]
+        self._params_by_name = {param.param_name: param for param in self.runtime_params}
 
     def spawn(self, 
               environment: EnvironmentSet, 
@@ -287,7 +417,7 @@ class LlamaSrbRuntime(Runtime):
             raise ValueError(f"Unsupported model format: {model.model_format}")
 
         # Build command line
-        ctx_param = next(param for param in self.runtime_params if param.param_name == "ctx")
+        ctx_param = self._params_by_name["ctx"]
         ctx_value = ctx_param.param_enum[param_list.get("ctx", "8K")]
         cmd = [
             self.script_path,
@@ -339,6 +469,7 @@ class LiteLLMRuntime(Runtime):
                 param_default=''
             )
         ]
+        self._params_by_name = {param.param_name: param for param in self.runtime_params}
 
     def spawn(self, 
               environment: EnvironmentSet, 
@@ -456,6 +587,7 @@ class KoboldCppRuntime(Runtime):
                 param_default=""
             )
         ]
+        self._params_by_name = {param.param_name: param for param in self.runtime_params}
 
     def spawn(self, 
               environment: EnvironmentSet, 
@@ -480,7 +612,7 @@ class KoboldCppRuntime(Runtime):
             raise ValueError(f"Unsupported model format: {model.model_format}")
 
         # Build command line
-        context_param = next(param for param in self.runtime_params if param.param_name == "contextsize")
+        context_param = self._params_by_name["contextsize"]
         context_value = context_param.param_enum[param_list.get("contextsize", "4K")]
         
         model_spec = ["--model", model.model_id] if model.model_format == "gguf" else [model.model_id]
@@ -494,11 +626,11 @@ class KoboldCppRuntime(Runtime):
         ]
 
         # Add flash attention if enabled
-        if param_list.get("flashattention", False):
+        if param_list.get("flashattention", True):
             cmd.append("--flashattention")
 
         # Add quantkv parameter
-        quantkv_param = next(param for param in self.runtime_params if param.param_name == "quantkv")
+        quantkv_param = self._params_by_name["quantkv"]
         quantkv_value = quantkv_param.param_enum[param_list.get("quantkv", "f16")]
         cmd.extend(["--quantkv", str(quantkv_value)])
 
@@ -513,8 +645,7 @@ class KoboldCppRuntime(Runtime):
         # Set protocol based on model type and configuration
         if model.model_format == "kcppt":
             # Load and parse the checkpoint file
-            with open(model.model_id, 'r') as f:
-                config = json.load(f)
+            config = load_json_cached(model.model_id)
             # If it has an SD model, it's an SD checkpoint
             if config.get('sdmodel'):
                 listener.protocol = 'a1111'
@@ -581,6 +712,7 @@ class SDServerRuntime(Runtime):
                 param_default=""
             )
         ]
+        self._params_by_name = {param.param_name: param for param in self.runtime_params}
 
     def _get_model_path(self, model_file: str, base_dir: str) -> str:
         """Get the full path for a model file.
@@ -630,9 +762,8 @@ class SDServerRuntime(Runtime):
             raise ValueError(f"Unsupported model format: {model.model_format}")
 
         # Load and parse the checkpoint file
-        with open(model.model_id, 'r') as f:
-            config = json.load(f)
-            
+        config = load_json_cached(model.model_id)
+
         # Get the base directory for resolving relative paths
         base_dir = os.path.dirname(os.path.abspath(model.model_id))
         
@@ -668,7 +799,7 @@ class SDServerRuntime(Runtime):
             cmd.extend(["--vae", vae])
 
         # Add runtime parameters
-        sampling_param = next(param for param in self.runtime_params if param.param_name == "sampler_name")
+        sampling_param = self._params_by_name["sampler_name"]
         sampling_value = sampling_param.param_enum[param_list.get("sampler_name", "Euler")]
         cmd.extend(["--sampling-method", sampling_value])
         
@@ -761,6 +892,7 @@ class TabbyRuntime(Runtime):
                 param_default=""
             )            
         ]
+        self._params_by_name = {param.param_name: param for param in self.runtime_params}
 
     def spawn(self, 
               environment: EnvironmentSet, 
@@ -785,7 +917,7 @@ class TabbyRuntime(Runtime):
             raise ValueError(f"Unsupported model format: {model.model_format}")
 
         # Build command line
-        max_seq_len_param = next(param for param in self.runtime_params if param.param_name == "max_seq_len")
+        max_seq_len_param = self._params_by_name["max_seq_len"]
         max_seq_len_value = max_seq_len_param.param_enum[param_list.get("max_seq_len", "4K")]
         cmd = [
             self.script_path,
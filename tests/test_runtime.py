@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import EnvironmentSet, Listener, Model
+from runtime import KoboldCppRuntime, LlamaRuntime
+
+def spawn_command(runtime, param_list):
+    """Return the command line runtime.spawn() would start for a GGUF model."""
+    model = Model(zoo_name="zoo", model_id="/models/m.gguf", model_format="gguf")
+    with mock.patch("runtime.RunningModel") as running_model:
+        runtime.spawn(EnvironmentSet(), Listener("openai", "127.0.0.1", 5000), model, param_list)
+    return running_model.call_args.kwargs["command"]
+
+class LlamaRuntimeTest(unittest.TestCase):
+    def setUp(self):
+        self.runtime = LlamaRuntime("Llama", "/usr/bin/llama-server")
+
+    def test_flash_attention_defaults_to_on(self):
+        self.assertIn("-fa", spawn_command(self.runtime, {}))
+
+    def test_flash_attention_can_be_disabled(self):
+        self.assertNotIn("-fa", spawn_command(self.runtime, {"flash_attention": False}))
+
+class KoboldCppRuntimeTest(unittest.TestCase):
+    def setUp(self):
+        self.runtime = KoboldCppRuntime("KoboldCpp", "/usr/bin/koboldcpp")
+
+    def test_flashattention_defaults_to_on(self):
+        self.assertIn("--flashattention", spawn_command(self.runtime, {}))
+
+    def test_flashattention_can_be_disabled(self):
+        self.assertNotIn("--flashattention", spawn_command(self.runtime, {"flashattention": False}))
+
+if __name__ == "__main__":
+    unittest.main()
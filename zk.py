@@ -1,14 +1,26 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import yaml
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 from flask import Flask, jsonify, request, render_template
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 import random
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from asgiref.wsgi import WsgiToAsgi
+from dataclasses import dataclass, field, replace
 import socket
+import decimal
+import threading
+import atexit
+import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 
 from base import *
 from zoo import *
@@ -33,6 +45,123 @@ def exception_handler(f):
             }), 500
     return decorated_function
 
+def _json_default(obj: Any) -> Any:
+    """Encode the types Flask's default provider supports and orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and the tojson template filter.
+    
+    Dataclasses such as ModelLaunchInfo and their datetime fields are encoded natively by
+    orjson, only other unsupported types go through _json_default.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_json_default).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=_json_default), mimetype="application/json")
+
+# Classes that may be named in the config file, resolved by name instead of eval()
+ZOO_CLASSES = {cls.__name__: cls for cls in Zoo.__subclasses__()}
+RUNTIME_CLASSES = {cls.__name__: cls for cls in Runtime.__subclasses__()}
+
+# Stands in for the suggested port when rendering the index page, replaced on every request
+RANDOM_PORT_PLACEHOLDER = '__random_port__'
+
+def port_is_free(port: int) -> bool:
+    """Check whether nothing is listening on a port by briefly binding to it."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(('', port))
+            return True
+        except OSError:
+            return False
+
+def read_config(config_path: str) -> Dict:
+    """Load the YAML config, reusing a JSON copy next to it while the file is unchanged.
+    
+    Set MODELZOO_NO_CONFIG_CACHE=1 to always parse the YAML and leave no cache behind.
+    """
+    if os.environ.get('MODELZOO_NO_CONFIG_CACHE'):
+        with open(config_path) as f:
+            return yaml.load(f, Loader=YamlLoader)
+
+    stat = os.stat(config_path)
+    cache_path = config_path + '.cache.json'
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = orjson.loads(f.read())
+        if (cached['mtime'], cached['size']) == (stat.st_mtime_ns, stat.st_size):
+            return cached['config']
+    except Exception:
+        pass
+
+    with open(config_path) as f:
+        config = yaml.load(f, Loader=YamlLoader)
+
+    # Only cache configs that survive the trip through JSON unchanged (no dates, non-string keys, ...)
+    try:
+        data = orjson.dumps({'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'config': config})
+        if orjson.loads(data)['config'] == config:
+            # The config may hold API keys, so the copy gets the same permissions as the YAML
+            mode = stat.st_mode & 0o777
+            tmp_path = f"{cache_path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+            with os.fdopen(fd, 'wb') as f:
+                os.fchmod(f.fileno(), mode)
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+    except (TypeError, OSError) as e:
+        print(f"Warning: Could not write config cache {cache_path}: {e}")
+    return config
+
+def lookup_class(registry: Dict[str, type], class_name: str) -> type:
+    if class_name not in registry:
+        raise ValueError(f"Unknown class '{class_name}', expected one of: {', '.join(sorted(registry))}")
+    return registry[class_name]
+
+class CatalogCache:
+    """Holds the catalog of a zoo until the zoo reports a new catalog_version()."""
+
+    def __init__(self, zoo: Zoo):
+        self.zoo = zoo
+        self.version = None
+        self.models: List[Model] = None
+        self.by_id: Dict[str, Model] = {}
+
+    def is_current(self, version: Any) -> bool:
+        """Whether the cached catalog is still valid for the given catalog_version()."""
+        return self.models is not None and version is not None and version == self.version
+
+    def store(self, version: Any, models: List[Model]) -> List[Model]:
+        self.models = models
+        self.by_id = {model.model_id: model for model in self.models}
+        self.version = version
+        return self.models
+
+    def refresh(self, version: Any) -> List[Model]:
+        return self.store(version, self.zoo.catalog())
+
+    def catalog(self) -> List[Model]:
+        version = self.zoo.catalog_version()
+        if not self.is_current(version):
+            self.refresh(version)
+        return self.models
+
+    def get_model(self, model_id: str) -> Model:
+        """Look up a model by id, refreshing the catalog first if it is stale."""
+        self.catalog()
+        return self.by_id.get(model_id)
+
 @dataclass
 class ModelLaunchInfo:
     zoo_name: str
@@ -42,20 +171,48 @@ class ModelLaunchInfo:
     last_runtime: str = None
     last_environment: str = None
     last_params: Dict = None
+    # ISO form of last_launch, kept alongside it so saves do not reformat every entry
+    _last_launch_iso: str = field(default=None, init=False, repr=False, compare=False)
+
+    def set_last_launch(self, last_launch: datetime, last_launch_iso: str = None):
+        self.last_launch = last_launch
+        self._last_launch_iso = last_launch_iso or (last_launch.isoformat() if last_launch else None)
+
+    def to_json(self) -> Dict:
+        """Return a JSON-ready dict of this entry."""
+        return {
+            'zoo_name': self.zoo_name,
+            'model_name': self.model_name,
+            'launch_count': self.launch_count,
+            'last_launch': self._last_launch_iso,
+            'last_runtime': self.last_runtime,
+            'last_environment': self.last_environment,
+            'last_params': self.last_params
+        }
 
 class ModelHistory:
-    def __init__(self, history_file: str = 'history.json'):
+    def __init__(self, history_file: str = 'history.json', flush_interval: float = 1.0):
         self.history_file = history_file
-        self.model_info: Dict[str, ModelLaunchInfo] = {}
+        self.flush_interval = flush_interval
+        self.model_info: Dict[Tuple[str, str], ModelLaunchInfo] = {}  # keyed by (zoo_name, model_name)
+        self.version = 0  # Bumped on every change, lets callers cache results derived from the history
+        self.zoo_versions: Dict[str, int] = {}  # Same, but per zoo so one launch does not invalidate every zoo
+        self.launch_info_by_name: Dict[str, ModelLaunchInfo] = {}  # Same entries keyed "zoo_name:model_name" for the web page
         self.load_history()
 
+        # Launches only mark the history dirty and arm a timer, so bursts coalesce into one write
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._flush_timer = None
+        atexit.register(self.flush)
+
     def load_history(self):
         try:
-            with open(self.history_file, 'r') as f:
-                data = json.load(f)
-                for key, value in data.items():
-                    # Convert datetime string to datetime object
-                    value['last_launch'] = datetime.fromisoformat(value['last_launch']) if value['last_launch'] else None
+            with open(self.history_file, 'rb') as f:
+                data = orjson.loads(f.read())
+                for value in data.values():
+                    # Convert datetime string to datetime object, keeping the string for saving
+                    last_launch_iso = value.pop('last_launch', None)
                     
                     # Ensure last_environment is a list
                     if 'last_environment' in value and value['last_environment'] is not None:
@@ -63,56 +220,109 @@ class ModelHistory:
                             # Convert legacy string to list
                             value['last_environment'] = [value['last_environment']]
                     
-                    self.model_info[key] = ModelLaunchInfo(**value)
+                    info = ModelLaunchInfo(**value)
+                    info.set_last_launch(datetime.fromisoformat(last_launch_iso) if last_launch_iso else None, last_launch_iso)
+                    self.model_info[(info.zoo_name, info.model_name)] = info
+                    self.launch_info_by_name[f"{info.zoo_name}:{info.model_name}"] = info
         except FileNotFoundError:
             pass
 
     def save_history(self):
-        data = {k: asdict(v) for k, v in self.model_info.items()}
-        for value in data.values():
-            value['last_launch'] = value['last_launch'].isoformat() if value['last_launch'] else None
-        with open(self.history_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        data = {f"{zoo_name}:{model_name}": v.to_json() for (zoo_name, model_name), v in self.model_info.items()}
+        tmp_file = f"{self.history_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, self.history_file)
+
+    def flush(self):
+        """Write the history to disk if it changed since the last write."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.save_history()
+            self._dirty = False
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._flush_timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error saving model history to {self.history_file}: {str(e)}")
 
     def update_model_launch(self, zoo_name: str, model_name: str, runtime: str, environment: List[str], params: Dict):
-        key = f"{zoo_name}:{model_name}"
-        if key not in self.model_info:
-            self.model_info[key] = ModelLaunchInfo(zoo_name, model_name)
-        
-        info = self.model_info[key]
-        info.launch_count += 1
-        info.last_launch = datetime.now()
-        info.last_runtime = runtime
-        info.last_environment = environment  # Always store as a list
-        info.last_params = params
-        
-        self.save_history()
+        key = (zoo_name, model_name)
+        with self._lock:
+            if key not in self.model_info:
+                self.model_info[key] = ModelLaunchInfo(zoo_name, model_name)
+                self.launch_info_by_name[f"{zoo_name}:{model_name}"] = self.model_info[key]
+            
+            info = self.model_info[key]
+            info.launch_count += 1
+            info.set_last_launch(datetime.now())
+            info.last_runtime = runtime
+            info.last_environment = environment  # Always store as a list
+            info.last_params = params
+            
+            self.version += 1
+            self.zoo_versions[zoo_name] = self.zoo_versions.get(zoo_name, 0) + 1
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
     def get_sorted_models(self, models: List[Model]) -> List[Model]:
-        def get_launch_info(model):
-            key = f"{model.zoo_name}:{model.model_name}"
-            return self.model_info.get(key, ModelLaunchInfo(model.zoo_name, model.model_name))
+        model_info = self.model_info
+
+        def sort_key(model):
+            info = model_info.get((model.zoo_name, model.model_name))
+            return (-info.launch_count if info else 0, model.model_name.lower())
 
-        return sorted(models, key=lambda m: (
-            -get_launch_info(m).launch_count,
-            m.model_name.lower()
-        ))
+        return sorted(models, key=sort_key)
 
     def get_last_launch_info(self, zoo_name: str, model_name: str) -> ModelLaunchInfo:
-        key = f"{zoo_name}:{model_name}"
-        return self.model_info.get(key, ModelLaunchInfo(zoo_name, model_name))
+        return self.model_info.get((zoo_name, model_name), ModelLaunchInfo(zoo_name, model_name))
+
+    def get_launch_info_by_name(self) -> Dict[str, ModelLaunchInfo]:
+        """Return the history keyed by "zoo_name:model_name" strings, as used by the web page."""
+        return self.launch_info_by_name
 
 class ZooKeeper:
     def __init__(self, config_path: str):
         self.app = Flask(__name__)
+        self.app.json = OrjsonProvider(self.app)
         CORS(self.app)
         
         self.zoos: Dict[str, Zoo] = {}
+        self.catalogs: Dict[str, CatalogCache] = {}
+        self._sorted_catalogs: Dict[str, tuple] = {}
+        self._index_cache: tuple = None
         self.runtimes: Dict[str, Runtime] = {}
         self.environments: Dict[str, Environment] = {}
-        self.running_models: List[RunningModel] = []
+        self.running_models: Dict[int, RunningModel] = {}
+        self._next_id = 0
         self.model_history = ModelHistory()
         self.peers: List[Dict[str, str]] = []
+        self.hostname = socket.gethostname()
+
+        # Suggested ports cycle through a shuffled pool, skipping ports held by running models
+        self._port_pool = deque(random.sample(range(50000, 60001), 10001))
+        self._used_ports = set()
+
+        # Short-lived cache of get_available_models(), keyed by (local_models, remote_models)
+        self.available_models_ttl = 1.0
+        self._available_cache: Dict[tuple, tuple] = {}
+        self._available_locks: Dict[tuple, threading.Lock] = {}
+
+        # Shared session so peer polls reuse keep-alive connections
+        self.http_session = requests.Session()
+        self.http_session.mount('http://', HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=0))
+
+        # Peers that keep failing are skipped for a cooldown instead of waiting out the timeout every poll
+        self.peer_failure_threshold = 3
+        self.peer_cooldown = 30.0
+        self._peer_state: Dict[Tuple[str, int], Dict[str, float]] = {}
         
         # Load configuration
         self.load_config(config_path)
@@ -125,44 +335,46 @@ class ZooKeeper:
             enumerate=enumerate
         )
         
-    def get_asgi_app(self):
-        return WsgiToAsgi(self.app)
-
     def shutdown(self):
         print("Stopping all running models...")
-        for model in self.running_models:
+        for model in self.running_models.values():
             try:
                 model.stop(no_wait=True)
                 print(f"Stopped model: {model.model.model_name}")
             except Exception as e:
                 print(f"Error stopping model {model.model.model_name}: {str(e)}")
         self.running_models.clear()
+        self._used_ports.clear()
         print("All models stopped.")
+        self.model_history.flush()
 
     def load_config(self, config_path: str):
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+        config = read_config(config_path)
             
         # Load zoos
         for zoo_config in config.get('zoos', []):
             try:
-                zoo_class = eval(zoo_config['class'])
+                zoo_class = lookup_class(ZOO_CLASSES, zoo_config['class'])
                 zoo = zoo_class(name=zoo_config.get('name',zoo_config['class']), **zoo_config['params'])
-                self.zoos[zoo_config['name']] = zoo
+                self.zoos[zoo.name] = zoo
+                self.catalogs[zoo.name] = CatalogCache(zoo)
             except Exception as e:
-                print(f"Error creating zoo '{zoo_config['name']}' of class '{zoo_config['class']}': {str(e)}")
+                print(f"Error creating zoo '{zoo_config.get('name','<missing_name>')}' of class '{zoo_config.get('class','<missing class>')}': {str(e)}")
                 raise e
 
         # Load runtimes
         for runtime_config in config.get('runtimes', []):
             try:
-                runtime_class = eval(runtime_config['class'])
+                runtime_class = lookup_class(RUNTIME_CLASSES, runtime_config['class'])
                 runtime = runtime_class(name=runtime_config.get('name',runtime_config['class']), **runtime_config['params'])
                 self.runtimes[runtime.runtime_name] = runtime
             except Exception as e:
                 print(f"Error creating runtime '{runtime_config.get('name','<missing_name>')}' of class '{runtime_config.get('class','<missing class>')}': {str(e)}")
                 raise e
 
+        # Runtimes do not change after loading, so the view handed to the page is built once
+        self._runtime_view = {name: {k: v for k, v in runtime.__dict__.items() if not k.startswith('_')} for name, runtime in self.runtimes.items()}
+
         # Load environments
         for env_config in config.get('envs', []):
             env = Environment(env_config['name'], env_config['vars'])
@@ -179,39 +391,76 @@ class ZooKeeper:
         self.app.route('/api/model/status', methods=['POST'])(exception_handler(self.handle_get_status))
         self.app.route('/api/running_models')(exception_handler(self.handle_get_running_models))
 
-    def handle_get_status(self):
-        data = request.get_json()
+    def get_running_model(self, data: Dict) -> RunningModel:
+        """Look up a running model by the id a request passes as 'idx', or None if it is gone."""
         model_idx = data.get('idx')
-        model_idx = int(model_idx) if model_idx is not None else None
-        if model_idx is not None and 0 <= model_idx < len(self.running_models):
+        return self.running_models.get(int(model_idx)) if model_idx is not None else None
+
+    def handle_get_status(self):
+        running_model = self.get_running_model(request.get_json())
+        if running_model is not None:
             return jsonify({
                 'success': True,
-                'status': self.running_models[model_idx].status()
+                'status': running_model.status()
             })
         return jsonify({'success': False, 'error': 'Model not found'}), 404
 
-    def sort_models(self, catalog):
-        return self.model_history.get_sorted_models(catalog)
+    def get_catalog(self, zoo_name: str) -> List[Model]:
+        return self.catalogs[zoo_name].catalog()
+
+    def get_catalogs(self) -> Dict[str, List[Model]]:
+        """Return the catalogs of all zoos, rescanning the stale ones concurrently."""
+        versions = {name: cache.zoo.catalog_version() for name, cache in self.catalogs.items()}
+        stale = [name for name, cache in self.catalogs.items() if not cache.is_current(versions[name])]
+        for name, models in zip(stale, catalog_all([self.zoos[name] for name in stale])):
+            self.catalogs[name].store(versions[name], models)
+        return {name: cache.models for name, cache in self.catalogs.items()}
+
+    def sort_models(self, zoo_name: str, catalog: List[Model] = None) -> List[Model]:
+        """Return the catalog of a zoo sorted by launch history, re-sorting only when either changes."""
+        if catalog is None:
+            catalog = self.get_catalog(zoo_name)
+        version = self.model_history.zoo_versions.get(zoo_name, 0)
+        cached = self._sorted_catalogs.get(zoo_name)
+        if cached is None or cached[0] is not catalog or cached[1] != version:
+            cached = (catalog, version, self.model_history.get_sorted_models(catalog))
+            self._sorted_catalogs[zoo_name] = cached
+        return cached[2]
 
     def get_random_port(self):
+        for _ in range(len(self._port_pool)):
+            port = self._port_pool.pop()
+            self._port_pool.appendleft(port)
+            if port not in self._used_ports and port_is_free(port):
+                return port
         return random.randint(50000, 60000)
 
     def render_index(self):
-        model_launch_info = {}
-        for zoo in self.zoos.values():
-            for model in zoo.catalog():
-                key = f"{model.zoo_name}:{model.model_name}"
-                model_launch_info[key] = self.model_history.get_last_launch_info(model.zoo_name, model.model_name)
-
-        return render_template('index.html',
-            zoos={name: {'catalog': self.sort_models(zoo.catalog())} for name, zoo in self.zoos.items()},
-            available_models=self.get_available_models(),
-            runtimes={name: {**runtime.__dict__} for name, runtime in self.runtimes.items()},
-            environments=self.environments,
-            random_port=self.get_random_port(),
-            model_launch_info=model_launch_info,
-            hostname=socket.gethostname()
-        )
+        catalogs = [self.sort_models(name, catalog) for name, catalog in self.get_catalogs().items()]
+        available_models = self.get_available_models()
+        history_version = self.model_history.version
+
+        # The page only changes with the sorted catalogs, the history and the running models,
+        # so it is re-rendered only when one of them did. The port suggestion is spliced in per request.
+        cached = self._index_cache
+        if cached is None or cached[0] != history_version or cached[1] != available_models or cached[2] != catalogs:
+            zoos = {name: {'catalog': catalog} for name, catalog in zip(self.zoos, catalogs)}
+            # Models missing from the history fall back to "never launched" in the page itself,
+            # so the history is passed as-is instead of looking up every catalog entry
+            html = render_template('index.html',
+                zoos=zoos,
+                available_models=available_models,
+                runtimes=self._runtime_view,
+                environments=self.environments,
+                random_port=RANDOM_PORT_PLACEHOLDER,
+                model_launch_info=self.model_history.get_launch_info_by_name(),
+                hostname=self.hostname
+            )
+            cached = (history_version, available_models, catalogs, html.split(RANDOM_PORT_PLACEHOLDER, 1))
+            self._index_cache = cached
+
+        head, tail = cached[3]
+        return head + str(self.get_random_port()) + tail
 
     def handle_launch_model(self):
         data = request.get_json()
@@ -228,7 +477,7 @@ class ZooKeeper:
         if not zoo:
             return jsonify({'success': False, 'error': 'Zoo not found'}), 404
 
-        model = next((m for m in zoo.catalog() if m.model_id == model_id), None)
+        model = self.catalogs[zoo_name].get_model(model_id)
         if not model:
             return jsonify({'success': False, 'error': 'Model not found'}), 404
 
@@ -248,40 +497,44 @@ class ZooKeeper:
         # Create listener
         listener = Listener('http', '0.0.0.0', port)
 
-        # Update model name if custom name provided
+        # Update model name if custom name provided, copying so the cached catalog entry is untouched
         if custom_name:
-            model.model_name = custom_name
+            model = replace(model, model_name=custom_name)
 
         # Create an EnvironmentSet with all the environments
         env_set = EnvironmentSet(environments)
             
         # Spawn model
         running_model = runtime.spawn(env_set, listener, model, params)
-        self.running_models.append(running_model)
+        model_idx = self._next_id
+        self._next_id += 1
+        self.running_models[model_idx] = running_model
+        self._used_ports.add(port)
+        self._available_cache.clear()
 
         # Update launch history
         self.model_history.update_model_launch(model.zoo_name, model.model_name, runtime_name, env_names, params)
 
-        return jsonify({'success': True})
+        return jsonify({'success': True, 'id': model_idx})
 
     def handle_stop_model(self):
         data = request.get_json()
-        model_idx = data.get('idx')
-        model_idx = int(model_idx) if model_idx is not None else None
-        if model_idx is not None and 0 <= model_idx < len(self.running_models):
-            self.running_models[model_idx].stop()
-            self.running_models.pop(model_idx)
+        running_model = self.get_running_model(data)
+        if running_model is not None:
+            # Only forget the model once it has stopped, so a failed stop leaves it addressable
+            running_model.stop()
+            self.running_models.pop(int(data['idx']), None)
+            self._used_ports.discard(running_model.listener.port)
+            self._available_cache.clear()
             return jsonify({'success': True})
         return jsonify({'success': False, 'error': 'Model not found'}), 404
 
     def handle_get_logs(self):
-        data = request.get_json()
-        model_idx = data.get('idx')
-        model_idx = int(model_idx) if model_idx is not None else None
-        if model_idx is not None and 0 <= model_idx < len(self.running_models):
+        running_model = self.get_running_model(request.get_json())
+        if running_model is not None:
             return jsonify({
                 'success': True,
-                'logs': self.running_models[model_idx].logs()
+                'logs': running_model.logs()
             })
         return jsonify({'success': False, 'error': 'Model not found'}), 404
 
@@ -289,6 +542,37 @@ class ZooKeeper:
         running_models = self.get_available_models(local_models=True, remote_models=False)
         return jsonify({'running_models': running_models})
 
+    def _fetch_peer_models(self, peer: Dict) -> List[Dict]:
+        """Fetch the running models of a single peer, returning an empty list on failure.
+        
+        After peer_failure_threshold consecutive failures the peer is skipped for peer_cooldown seconds.
+        """
+        state = self._peer_state.setdefault((peer['host'], peer['port']), {'fails': 0, 'open_until': 0.0})
+        if time.monotonic() < state['open_until']:
+            return []
+
+        try:
+            response = self.http_session.get(
+                f"http://{peer['host']}:{peer['port']}/api/running_models", 
+                timeout=5
+            )
+            response.raise_for_status()
+            
+            peer_models = orjson.loads(response.content).get('running_models', [])
+            for model in peer_models:
+                model['listener']['host'] = peer['host']
+                model['source'] = f"remote:{peer['host']}"
+            state['fails'] = 0
+            return peer_models
+                
+        except Exception as e:
+            print(f"Error fetching models from peer {peer['host']}:{peer['port']}: {str(e)}")
+            state['fails'] += 1
+            if state['fails'] >= self.peer_failure_threshold:
+                state['open_until'] = time.monotonic() + self.peer_cooldown
+                print(f"Skipping peer {peer['host']}:{peer['port']} for {self.peer_cooldown:.0f}s after {state['fails']} failures")
+            return []
+
     def get_available_models(self, local_models: bool = True, remote_models: bool = True) -> List[Dict]:
         """Get a unified list of available models from both local and remote sources.
         
@@ -299,6 +583,7 @@ class ZooKeeper:
         Returns:
             List of model dictionaries with consistent structure:
             {
+                'id': int,  # id of the running model on its own host, used by stop/logs/status
                 'model_name': str,
                 'model_id': str,
                 'status': dict,
@@ -310,13 +595,35 @@ class ZooKeeper:
                 'source': str,  # 'local' or 'remote:hostname'
                 'environment': str  # name of the environment used to launch the model
             }
+
+            Results are shared between callers for available_models_ttl seconds, and only
+            one caller at a time refreshes a given combination of sources.
         """
+        # Without peers a remote query is the same as a local one, so both share a cache entry
+        remote_models = remote_models and bool(self.peers)
+        key = (local_models, remote_models)
+        cached = self._available_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.available_models_ttl:
+            return cached[1]
+
+        with self._available_locks.setdefault(key, threading.Lock()):
+            # Another caller may have refreshed while we waited for the lock
+            cached = self._available_cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.available_models_ttl:
+                return cached[1]
+
+            available_models = self._collect_available_models(local_models, remote_models)
+            self._available_cache[key] = (time.monotonic(), available_models)
+            return available_models
+
+    def _collect_available_models(self, local_models: bool, remote_models: bool) -> List[Dict]:
         available_models = []
         
         # Add local models
         if local_models:
-            for rmodel in self.running_models:
+            for model_idx, rmodel in self.running_models.items():
                 available_models.append({
+                    'id': model_idx,
                     'model_name': rmodel.model.model_name,
                     'model_id': rmodel.model.model_id,
                     'status': rmodel.status(),
@@ -329,24 +636,14 @@ class ZooKeeper:
                     'environment': rmodel.environment_set.get_combined_name()
                 })
         
-        # Add remote models
-        if remote_models:
-            for peer in self.peers:
-                try:
-                    response = requests.get(
-                        f"http://{peer['host']}:{peer['port']}/api/running_models", 
-                        timeout=5
-                    )
-                    response.raise_for_status()
-                    
-                    peer_models = response.json().get('running_models', [])
-                    for model in peer_models:
-                        model['listener']['host'] = peer['host']
-                        model['source'] = f"remote:{peer['host']}"
-                        available_models.append(model)
-                        
-                except Exception as e:
-                    print(f"Error fetching models from peer {peer['host']}:{peer['port']}: {str(e)}")
+        # Add remote models, polling all peers concurrently
+        peers = self.peers
+        if not remote_models or not peers:
+            return available_models
+
+        with ThreadPoolExecutor(max_workers=min(32, len(peers))) as executor:
+            for peer_models in executor.map(self._fetch_peer_models, peers):
+                available_models.extend(peer_models)
         
         return available_models
 
@@ -1,10 +1,86 @@
 from base import *
 from pathlib import Path
-from typing import Any, List, Dict
-import json
+from typing import Any, List, Dict, Iterator, Tuple
 import shutil
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import re
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+def _walk_files(path: str) -> Iterator[os.DirEntry]:
+    """Yield every file below path, like Path.rglob('*') but reusing the type and stat info scandir already has.
+    
+    As with rglob, symlinked folders are not descended into and unreadable folders are skipped.
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk_files(entry.path)
+                elif entry.is_file():
+                    yield entry
+    except OSError:
+        return
+
+# Split GGUF names look like <base>-00001-of-00003
+_MULTIPART_RE = re.compile(r'^(.+?)-\d{5}-of-\d{5}$')
+
+# (connect, read) timeouts for catalog requests, so an unreachable API cannot hang the page
+API_TIMEOUT = (3, 30)
+
+def _make_session() -> requests.Session:
+    """Session with a small keep-alive pool, so catalog refreshes reuse their connection."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _folder_version(path: str) -> Any:
+    """Modification times of a folder and every folder below it, as a cheap change token.
+    
+    Adding, removing or renaming a file at any depth changes the mtime of its folder.
+    As in _walk_files, symlinked folders are not descended into.
+    """
+    mtimes = [os.stat(path).st_mtime_ns]
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        mtimes.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+                        pending.append(entry.path)
+        except OSError:
+            continue
+    return tuple(mtimes)
+
+def _rescan_epoch(interval: float) -> int:
+    """Counter that ticks every interval seconds, so version tokens built from it expire; 0 if interval is unset."""
+    return int(time.monotonic() // interval) if interval else 0
+
+def catalog_all(zoos: List[Zoo], max_workers: int = 8) -> List[List[Model]]:
+    """Fetch the catalogs of several zoos concurrently.
+    
+    Under gevent the workers are greenlets, so this overlaps network-backed zoos (OpenAIZoo,
+    OllamaZoo) but disk-backed zoos still scan one after another, since scandir() and stat()
+    block the hub.
+
+    Args:
+        zoos (List[Zoo]): Zoos to fetch
+        max_workers (int): Maximum number of catalogs fetched at once (default: 8)
+
+    Returns:
+        List[List[Model]]: The catalog of each zoo, in the same order as zoos
+    """
+    if len(zoos) <= 1:
+        return [zoo.catalog() for zoo in zoos]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(zoos))) as executor:
+        return list(executor.map(lambda zoo: zoo.catalog(), zoos))
 
 class StaticZoo(Zoo):
     """Zoo implementation that returns a static list of Models."""
@@ -17,57 +93,57 @@ class StaticZoo(Zoo):
             models (List[Model]): List of Model instances
         """
         super().__init__(name)
-        for m in models:
-            if 'model_name' not in m: m['model_name'] = m['model_id']
-        self.models = [Model(zoo_name=name, **m) for m in models]
+        # model_name defaults to model_id, without writing it back into the config dicts
+        self.models = [Model(zoo_name=name, **{'model_name': m['model_id'], **m}) for m in models]
 
     def catalog(self) -> List[Model]:
         return self.models
 
+    def catalog_version(self) -> Any:
+        return 0
+
     def __str__(self) -> str:
         return f"StaticZoo(name={self.name}, models={len(self.models)})"
 
 class FolderZoo(Zoo):
     """Zoo implementation that discovers GGUF models in a filesystem folder."""
 
-    def __init__(self, name: str, path: str):
+    def __init__(self, name: str, path: str, rescan_interval: float = 60):
         """Initialize a FolderZoo with a specific path.
         
         Args:
             name (str): Name of the zoo
             path (str): Path to folder containing models
+            rescan_interval (float): Seconds after which the folder is rescanned even if no folder changed, 0 to disable (default: 60)
         """
         super().__init__(name)
         self.path = Path(path)
+        self._abs_root = str(self.path.absolute())  # Walks start here, so every path they yield is already absolute
+        self.rescan_interval = rescan_interval
         if not self.path.exists():
             raise ValueError(f"Path does not exist: {path}")
         if not self.path.is_dir():
             raise ValueError(f"Path is not a directory: {path}")
+        self._hf_size_cache: Dict[str, Tuple[int, int, int]] = {}  # HF folder -> (mtime_ns, rescan epoch, total size)
 
-    def _process_multipart_models(self, files: List[Path]) -> Dict[str, List[Path]]:
+    def _process_multipart_models(self, files: List[Tuple[str, int]]) -> Dict[str, List[Tuple[str, int]]]:
         """Group multi-part model files together.
         
         Args:
-            files (List[Path]): List of .gguf files
+            files (List[Tuple[str, int]]): List of (path, size) of .gguf files
 
         Returns:
-            Dict[str, List[Path]]: Dictionary mapping base names to file parts
+            Dict[str, List[Tuple[str, int]]]: Dictionary mapping base names to file parts
         """
         model_parts = {}
         
         for file_path in files:
-            name = file_path.stem
+            name = os.path.basename(file_path[0])[:-len(".gguf")]
             
-            # Check if this is a multi-part file
-            if "-of-" in name:
-                # Extract base name (everything before the part number)
-                base_name = name.split("-00")[0]
-                
-                # Initialize list for this base name if not exists
-                if base_name not in model_parts:
-                    model_parts[base_name] = []
-                    
-                model_parts[base_name].append(file_path)
+            # Check if this is a multi-part file, the base name is everything before the part number
+            match = _MULTIPART_RE.match(name)
+            if match:
+                model_parts.setdefault(match.group(1), []).append(file_path)
             else:
                 # Single file model
                 model_parts[name] = [file_path]
@@ -78,8 +154,14 @@ class FolderZoo(Zoo):
         """Scan folder path and return list of discovered GGUF models."""
         models = []
         
-        # Get all .gguf files
-        gguf_files = list(self.path.rglob("*.gguf"))
+        # Get all .gguf files along with their sizes, in one walk
+        gguf_files = []
+        for entry in _walk_files(self._abs_root):
+            if entry.name.endswith(".gguf"):
+                try:
+                    gguf_files.append((entry.path, entry.stat().st_size))
+                except OSError as e:
+                    print(f"Warning: Error reading GGUF file {entry.path}: {e}")
         
         # Group multi-part files
         model_parts = self._process_multipart_models(gguf_files)
@@ -88,14 +170,14 @@ class FolderZoo(Zoo):
         for base_name, parts in model_parts.items():
             try:
                 # Calculate total size across all parts
-                total_size = sum(part.stat().st_size for part in parts)
+                total_size = sum(size for _, size in parts)
                 
                 # For multi-part models, use the first part as the model_id
-                model_id = str(sorted(parts)[0].absolute())
+                model_id = min(parts)[0]
                 
                 # Create model instance
                 model = Model(
-                    zoo_name=self.name,                    
+                    zoo_name=self.name,
                     model_id=model_id,
                     model_format="gguf",
                     model_name=base_name,
@@ -109,51 +191,77 @@ class FolderZoo(Zoo):
                 
         return models
 
+    def _hf_folder_size(self, dir_entry: os.DirEntry) -> int:
+        """Total size of an HF model folder, reusing the last total while the folder mtime and rescan epoch are unchanged."""
+        key = (dir_entry.stat().st_mtime_ns, _rescan_epoch(self.rescan_interval))
+        cached = self._hf_size_cache.get(dir_entry.path)
+        if cached and cached[:2] == key:
+            return cached[2]
+        total_size = sum(entry.stat().st_size for entry in _walk_files(dir_entry.path))
+        self._hf_size_cache[dir_entry.path] = key + (total_size,)
+        return total_size
+
     def _hf_catalog(self) -> List[Model]:
         """Scan folder path and return list of discovered HF models."""
         models = []
         
-        # Get all directories
-        for dir_path in self.path.iterdir():
-            if dir_path.is_dir():
-                config_file = dir_path / "config.json"
-                if config_file.exists():
-                    try:
-                        with open(config_file, 'r') as f:
-                            config = json.load(f)
-                        
-                        quant_config = config.get('quantization_config', {})
-                        model_format = quant_config.get('quant_method', 'unknown')
-                        
-                        # If model_format is still unknown, apply heuristics
-                        if model_format == 'unknown':
-                            folder_name = dir_path.name.lower()
-                            if 'gptq' in folder_name:
-                                model_format = 'gptq'
-                            elif 'awq' in folder_name:
-                                model_format = 'awq'
-                            elif 'exl2' in folder_name:
-                                model_format = 'exl2'
-                            elif 'fp16' in folder_name:
-                                model_format = 'fp16'
-                                
-                        # Calculate total size of the folder
-                        total_size = sum(f.stat().st_size for f in dir_path.rglob('*') if f.is_file())
-                        
-                        model = Model(
-                            zoo_name=self.name,
-                            model_id=str(dir_path.absolute()),
-                            model_format=model_format,
-                            model_name=dir_path.name,
-                            model_size=total_size
-                        )
-                        models.append(model)
-                    except Exception as e:
-                        print(f"Warning: Error processing HF model {dir_path.name}: {e}")
-                        continue
+        # Get all directories with a config.json and work out their format
+        with os.scandir(self._abs_root) as entries:
+            dir_entries = [entry for entry in entries if entry.is_dir()]
+
+        candidates = []
+        for dir_entry in dir_entries:
+            try:
+                config = load_json_cached(os.path.join(dir_entry.path, "config.json"))
+                
+                quant_config = config.get('quantization_config', {})
+                model_format = quant_config.get('quant_method', 'unknown')
+                
+                # If model_format is still unknown, apply heuristics
+                if model_format == 'unknown':
+                    folder_name = dir_entry.name.lower()
+                    if 'gptq' in folder_name:
+                        model_format = 'gptq'
+                    elif 'awq' in folder_name:
+                        model_format = 'awq'
+                    elif 'exl2' in folder_name:
+                        model_format = 'exl2'
+                    elif 'fp16' in folder_name:
+                        model_format = 'fp16'
+
+                candidates.append((dir_entry, model_format))
+            except FileNotFoundError:
+                # Not a model folder
+                continue
+            except Exception as e:
+                print(f"Warning: Error processing HF model {dir_entry.name}: {e}")
+                continue
+
+        for dir_entry, model_format in candidates:
+            try:
+                size = self._hf_folder_size(dir_entry)
+                model = Model(
+                    zoo_name=self.name,
+                    model_id=dir_entry.path,
+                    model_format=model_format,
+                    model_name=dir_entry.name,
+                    model_size=size
+                )
+                models.append(model)
+            except Exception as e:
+                print(f"Warning: Error processing HF model {dir_entry.name}: {e}")
+                continue
         
         return models
 
+    def catalog_version(self) -> Any:
+        """Use the modification times of every folder in the tree, expiring every rescan_interval seconds.
+        
+        Folder mtimes change when models are added, removed or renamed at any depth. Files that
+        grow in place (e.g. weights still being downloaded) are picked up by the periodic rescan.
+        """
+        return (_rescan_epoch(self.rescan_interval), _folder_version(self._abs_root))
+
     def catalog(self) -> List[Model]:
         """Scan folder path and return list of discovered GGUF and HF models.
         
@@ -170,7 +278,7 @@ class FolderZoo(Zoo):
 class OpenAIZoo(Zoo):
     """Zoo implementation that fetches models from an OpenAI-compatible API."""
 
-    def __init__(self, name: str, api_url: str, api_key: str = None, api_key_env: str = None, cache: bool = True, models: List[str] = None):
+    def __init__(self, name: str, api_url: str, api_key: str = None, api_key_env: str = None, cache: bool = True, models: List[str] = None, cache_ttl: float = None):
         """Initialize an OpenAIZoo with API details.
         
         Args:
@@ -180,23 +288,38 @@ class OpenAIZoo(Zoo):
             api_key_env (str, optional): Environment variable name containing the API key
             cache (bool): Whether to cache the model list (default: True)
             models (List[str]): Optional list of models to override API exploration
+            cache_ttl (float, optional): Seconds before a cached model list is fetched again (default: kept until restart)
         """
         super().__init__(name)
         self.api_url = api_url.rstrip('/')
+        self._api_key = api_key
+        self._api_key_env = api_key_env
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self._cached_models = None
+        self._cached_at = 0.0
+        self.models = models
+        self._session = _make_session()
+
+    @functools.cached_property
+    def api_key(self) -> str:
+        """API key, resolved on first use so zoos that are never queried need no key.
         
-        if api_key_env:
-            self.api_key = os.environ.get(api_key_env)
-            if not self.api_key:
-                raise ValueError(f"Environment variable '{api_key_env}' not found or empty")
+        Raises:
+            ValueError: If the key is missing or its environment variable is not set
+        """
+        if self._api_key_env:
+            api_key = os.environ.get(self._api_key_env)
+            if not api_key:
+                raise ValueError(f"Environment variable '{self._api_key_env}' not found or empty")
         else:
-            self.api_key = api_key
+            api_key = self._api_key
         
-        if not self.api_key:
+        if not api_key:
             raise ValueError("API key must be provided either directly or through an environment variable")
         
-        self.cache = cache
-        self._cached_models = None
-        self.models = models
+        self._session.headers.update({"Authorization": f"Bearer {api_key}"})
+        return api_key
 
     def catalog(self) -> List[Model]:
         """Fetch and return list of available models from the API or use provided models.
@@ -204,6 +327,12 @@ class OpenAIZoo(Zoo):
         Returns:
             List[Model]: List of models available through the API or provided models
         """
+        try:
+            api_key = self.api_key  # Resolving the key also sets the session's Authorization header
+        except ValueError as e:
+            print(f"Error fetching models from API: {e}")
+            return []
+
         if self.models is not None:
             return [Model(
                 zoo_name=self.name,
@@ -211,19 +340,17 @@ class OpenAIZoo(Zoo):
                 model_format="litellm",
                 model_name=m.split('/')[-1].replace('.gguf', '').replace(' ','-'),
                 api_url=self.api_url,
-                api_key=self.api_key
+                api_key=api_key
             ) for m in self.models]
 
         if self.cache and self._cached_models is not None:
-            return self._cached_models
+            if self.cache_ttl is None or time.monotonic() - self._cached_at < self.cache_ttl:
+                return self._cached_models
 
         try:
-            response = requests.get(
-                f"{self.api_url}/models",
-                headers={"Authorization": f"Bearer {self.api_key}"}
-            )
+            response = self._session.get(f"{self.api_url}/models", timeout=API_TIMEOUT)
             if response.status_code != 200: print(response.text)
-            data = response.json()
+            data = orjson.loads(response.content)
             if isinstance(data, list): data = { 'data': data}
             
             models = []
@@ -238,15 +365,16 @@ class OpenAIZoo(Zoo):
                     model_format="litellm",
                     model_name=model_name,
                     api_url=self.api_url,
-                    api_key=self.api_key
+                    api_key=api_key
                 )
                 models.append(model)
             
             if self.cache:
                 self._cached_models = models
+                self._cached_at = time.monotonic()
             
             return models
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             print(f"Error fetching models from API: {e}")
             return []
 
@@ -256,45 +384,48 @@ class OpenAIZoo(Zoo):
 class KoboldCheckpointZoo(Zoo):
     """Zoo implementation that discovers Kobold checkpoint files."""
 
-    def __init__(self, name: str, path: str):
+    def __init__(self, name: str, path: str, recursive: bool = True, rescan_interval: float = 60):
         """Initialize a KoboldCheckpointZoo with a specific path.
         
         Args:
             name (str): Name of the zoo
             path (str): Path to folder containing checkpoint files
+            recursive (bool): Whether to look for checkpoints in subfolders too (default: True)
+            rescan_interval (float): Seconds after which the folder is rescanned even if no folder changed, 0 to disable (default: 60)
         """
         super().__init__(name)
         self.path = Path(path)
+        self._abs_root = str(self.path.absolute())  # Walks start here, so every path they yield is already absolute
+        self.recursive = recursive
+        self.rescan_interval = rescan_interval
         if not self.path.exists():
             raise ValueError(f"Path does not exist: {path}")
         if not self.path.is_dir():
             raise ValueError(f"Path is not a directory: {path}")
 
-    def _get_model_file_size(self, model_file: str, checkpoint_dir: Path) -> int:
+    def _get_model_file_size(self, model_file: str, checkpoint_dir: str) -> int:
         """Get the size of the referenced model file.
         
         Args:
             model_file (str): Name or URL of the model file
-            checkpoint_dir (Path): Directory containing the checkpoint
+            checkpoint_dir (str): Directory containing the checkpoint
             
         Returns:
             int: Size of the model file in bytes, or 0 if not found
         """
         # First check if model_file is an absolute path to an existing file
-        abs_path = Path(model_file)
-        if abs_path.is_absolute() and abs_path.exists():
+        if os.path.isabs(model_file):
             try:
-                return abs_path.stat().st_size
-            except:
-                return 0
+                return os.stat(model_file).st_size
+            except OSError:
+                pass
 
         # Extract filename from URL if needed
         filename = model_file.split('/')[-1]
-        model_path = checkpoint_dir / filename
         
         try:
-            return model_path.stat().st_size
-        except:
+            return os.stat(os.path.join(checkpoint_dir, filename)).st_size
+        except OSError:
             return 0
 
     def catalog(self) -> List[Model]:
@@ -306,12 +437,16 @@ class KoboldCheckpointZoo(Zoo):
         models = []
         
         # Get all .kcppt files
-        checkpoint_files = list(self.path.rglob("*.kcppt"))
+        if self.recursive:
+            entries = _walk_files(self._abs_root)
+        else:
+            with os.scandir(self._abs_root) as it:
+                entries = [entry for entry in it if entry.is_file()]
+        checkpoint_files = [entry for entry in entries if entry.name.endswith(".kcppt")]
         
         for checkpoint_file in checkpoint_files:
             try:
-                with open(checkpoint_file, 'r') as f:
-                    config = json.load(f)
+                config = load_json_cached(checkpoint_file.path)
                 
                 # Look for model path in config fields in priority order
                 model_path = None
@@ -322,14 +457,14 @@ class KoboldCheckpointZoo(Zoo):
                 
                 if model_path:
                     # Get size of the referenced model file
-                    model_size = self._get_model_file_size(model_path, checkpoint_file.parent)
+                    model_size = self._get_model_file_size(model_path, os.path.dirname(checkpoint_file.path))
                     
                     # Create model instance
                     model = Model(
                         zoo_name=self.name,
-                        model_id=str(checkpoint_file.absolute()),
+                        model_id=checkpoint_file.path,
                         model_format="kcppt",
-                        model_name=checkpoint_file.stem,
+                        model_name=checkpoint_file.name[:-len(".kcppt")],
                         model_size=model_size
                     )
                     models.append(model)
@@ -340,21 +475,34 @@ class KoboldCheckpointZoo(Zoo):
                 
         return models
 
+    def catalog_version(self) -> Any:
+        """Use the modification times of the folders searched, expiring every rescan_interval seconds as FolderZoo does.
+        
+        The periodic rescan picks up checkpoints edited in place, which leave their folder mtime unchanged.
+        """
+        folders = _folder_version(self._abs_root) if self.recursive else os.stat(self._abs_root).st_mtime_ns
+        return (_rescan_epoch(self.rescan_interval), folders)
+
     def __str__(self) -> str:
         return f"KoboldCheckpointZoo(path={self.path})"
 
 class OllamaZoo(Zoo):
     """Zoo implementation that fetches models from an Ollama API."""
 
-    def __init__(self, name: str, api_url: str = "http://localhost:11434"):
+    def __init__(self, name: str, api_url: str = "http://localhost:11434", cache_ttl: float = 60):
         """Initialize an OllamaZoo with API details.
         
         Args:
             name (str): Name of the zoo
             api_url (str): Base URL of the Ollama API (default: http://localhost:11434)
+            cache_ttl (float): Seconds to reuse the fetched model list, 0 to always fetch (default: 60)
         """
         super().__init__(name)
         self.api_url = api_url.rstrip('/')
+        self.cache_ttl = cache_ttl
+        self._cached_models = None
+        self._cached_at = 0.0
+        self._session = _make_session()
 
     def catalog(self) -> List[Model]:
         """Fetch and return list of available models from the Ollama API.
@@ -362,13 +510,16 @@ class OllamaZoo(Zoo):
         Returns:
             List[Model]: List of models available through the API
         """
+        if self._cached_models is not None and time.monotonic() - self._cached_at < self.cache_ttl:
+            return self._cached_models
+
         try:
-            response = requests.get(f"{self.api_url}/api/tags")
+            response = self._session.get(f"{self.api_url}/api/tags", timeout=API_TIMEOUT)
             if response.status_code != 200:
                 print(f"Error fetching models from Ollama API: {response.text}")
                 return []
 
-            data = response.json()
+            data = orjson.loads(response.content)
             models = []
             
             for model_data in data.get('models', []):
@@ -382,8 +533,10 @@ class OllamaZoo(Zoo):
                 )
                 models.append(model)
             
+            self._cached_models = models
+            self._cached_at = time.monotonic()
             return models
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             print(f"Error connecting to Ollama API: {e}")
             return []
 